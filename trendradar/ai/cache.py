@@ -0,0 +1,97 @@
+# coding=utf-8
+"""AI响应持久化缓存
+
+新闻源在多次轮询之间高度重复，相同的新闻项每天会被重复处理。
+将 提示词 → 模型响应 的结果以 SHA256 键持久化到本地 sqlite，
+命中时直接返回缓存结果，省去网络延迟和API费用。
+
+缓存读写失败时静默降级为未命中，绝不影响正常的生成流程。
+设置环境变量 TRENDRADAR_AI_CACHE=0 可关闭缓存。
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 缓存条目保留天数，过期条目在打开数据库时清理
+CACHE_TTL_DAYS = 7
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_disabled = False
+
+
+def _cache_path() -> Path:
+    """返回缓存数据库路径（~/.cache/trendradar/zhipu.db）"""
+    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "trendradar"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / "zhipu.db"
+
+
+def _get_conn() -> Optional[sqlite3.Connection]:
+    """懒加载sqlite连接，失败时永久关闭缓存"""
+    global _conn, _disabled
+    if _disabled or os.getenv("TRENDRADAR_AI_CACHE", "1") == "0":
+        return None
+    if _conn is not None:
+        return _conn
+    try:
+        conn = sqlite3.connect(str(_cache_path()), check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        # 清理过期条目，避免缓存无限增长
+        cutoff = time.time() - CACHE_TTL_DAYS * 86400
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+        conn.commit()
+        _conn = conn
+        return _conn
+    except Exception as e:
+        logger.debug(f"AI缓存初始化失败，已禁用缓存: {e}")
+        _disabled = True
+        return None
+
+
+def make_key(*parts: str) -> str:
+    """根据模型、任务类型、参数和输入内容生成缓存键"""
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """查询缓存，未命中或出错返回None"""
+    with _lock:
+        conn = _get_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.debug(f"AI缓存读取失败: {e}")
+            return None
+
+
+def set(key: str, value: str) -> None:
+    """写入缓存，出错时静默忽略"""
+    with _lock:
+        conn = _get_conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            conn.commit()
+        except Exception as e:
+            logger.debug(f"AI缓存写入失败: {e}")
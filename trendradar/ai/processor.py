@@ -1,11 +1,62 @@
 """AI处理器"""
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from .zhipu_client import ZhipuClient
 
 logger = logging.getLogger(__name__)
 
+# 格式化输出用的分隔线，模块加载时构造一次
+_SEP_HEAVY = "━" * 20
+_SEP_LIGHT = "─" * 20
+_HR = "━" * 74
+
+# 并发调用AI接口的默认线程数（受限于智谱API限流）
+DEFAULT_CONCURRENCY = 16
+
+# 单次LLM调用打包的新闻条数
+DEFAULT_BATCH_SIZE = 5
+
+# 分类关键词，按优先级排列（先匹配的类别优先）
+_CATEGORY_KEYWORDS = [
+    ("科技AI", ("AI", "人工智能", "机器学习", "大模型", "科技", "创业", "投资", "开源", "程序员", "算法")),
+    ("游戏娱乐", ("游戏", "电竞", "Steam", "直播", "娱乐", "DOTA", "LOL", "王者", "原神", "米哈游")),
+    ("硬件数码", ("芯片", "GPU", "CPU", "手机", "iPhone", "华为", "小米", "硬件", "数码", "平板")),
+]
+
+# 每个类别的关键词预编译为单个交替正则，
+# 扫描在C层一次完成，避免每条新闻做Python层的逐词in检查
+_CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in _CATEGORY_KEYWORDS
+]
+
+_DEFAULT_CATEGORY = "科技AI"
+
+# 视频格式化使用的分类顺序与文案，模块加载时构造一次
+_CATEGORY_ORDER = ("科技AI类", "游戏娱乐类", "硬件数码类")
+
+_CATEGORY_ICONS = {
+    "科技AI": "🤖",
+    "游戏娱乐": "🎮",
+    "硬件数码": "💻"
+}
+
+_CATEGORY_INTROS = {
+    "科技AI类": "首先，让我们关注人工智能和科技创新领域的最新动态。",
+    "游戏娱乐类": "接下来，我们来看看游戏娱乐行业的热门资讯。",
+    "硬件数码类": "最后，让我们了解一下硬件数码市场的最新消息。"
+}
+
+_CATEGORY_VISUALS = {
+    "科技AI类": "AI芯片、机器人、代码界面等科技元素",
+    "游戏娱乐类": "游戏画面、手柄、电竞场景等娱乐元素",
+    "硬件数码类": "手机、电脑、芯片等硬件产品"
+}
+
 
 class AIProcessor:
     """AI智能处理器"""
@@ -16,7 +67,7 @@ class AIProcessor:
         Args:
             config: AI配置字典
         """
-        print(f"🔍 AIProcessor初始化，config = {config}")
+        logger.debug(f"AIProcessor初始化，config = {config}")
         self.config = config
         self.enabled = config.get("enabled", False)
         self.provider = config.get("provider", "zhipu")
@@ -27,26 +78,23 @@ class AIProcessor:
         self.generate_script = config.get("generate_script", True)
         self.generate_storyboard = config.get("generate_storyboard", True)
         
-        print(f"🔍 AI配置: enabled={self.enabled}, provider={self.provider}")
-        
+        logger.debug(f"AI配置: enabled={self.enabled}, provider={self.provider}")
+
         # 初始化AI客户端
         self.client = None
         if self.enabled:
             try:
-                print(f"🔍 尝试初始化{self.provider}客户端...")
                 if self.provider == "zhipu":
                     self.client = ZhipuClient()
-                    print("✅ ZhipuClient初始化成功")
+                    logger.debug("ZhipuClient初始化成功")
                 else:
-                    print(f"❌ 不支持的AI提供商: {self.provider}")
                     logger.warning(f"不支持的AI提供商: {self.provider}")
                     self.enabled = False
             except Exception as e:
-                print(f"❌ 初始化AI客户端失败: {e}")
                 logger.error(f"初始化AI客户端失败: {e}")
                 self.enabled = False
         else:
-            print("❌ AI处理未启用")
+            logger.debug("AI处理未启用")
     
     def process_news_item(self, news_item: Dict[str, Any]) -> Dict[str, Any]:
         """处理单条新闻
@@ -63,22 +111,23 @@ class AIProcessor:
         try:
             title = news_item.get("title", "")
             content = news_item.get("content", "") or news_item.get("description", "")
-            
-            # 生成AI处理后的内容
-            ai_title = self.client.generate_title(content, title, self.title_length)
-            ai_summary = self.client.generate_summary(content, title, self.summary_length)
-            ai_tag = self.client.generate_tag(content, title)
-            
-            # 更新新闻项
-            processed_item = news_item.copy()
-            processed_item.update({
-                "ai_title": ai_title,
-                "ai_summary": ai_summary,
-                "ai_tag": ai_tag,
-                "original_title": title
-            })
-            
-            return processed_item
+            # 提示词最多使用前1000字，先截断一次，
+            # 客户端内部的再次切片只作用于已截短的字符串
+            content = content[:1000]
+
+            # 一次调用同时生成标题、摘要和标签
+            ai_result = self.client.generate_all(
+                content, title, self.title_length, self.summary_length
+            )
+
+            # 更新新闻项（单次字典合并，避免copy+update两次建表）
+            return {
+                **news_item,
+                "ai_title": ai_result["title"],
+                "ai_summary": ai_result["summary"],
+                "ai_tag": ai_result["tag"],
+                "original_title": title,
+            }
             
         except Exception as e:
             logger.error(f"处理新闻项失败: {e}")
@@ -95,23 +144,63 @@ class AIProcessor:
         """
         if not self.enabled:
             return news_list
-        
-        processed_list = []
-        for i, news_item in enumerate(news_list):
-            try:
-                processed_item = self.process_news_item(news_item)
-                processed_list.append(processed_item)
-                
-                # 添加进度日志
-                if (i + 1) % 10 == 0:
-                    logger.info(f"AI处理进度: {i + 1}/{len(news_list)}")
-                    
-            except Exception as e:
-                logger.error(f"处理第{i+1}条新闻失败: {e}")
-                processed_list.append(news_item)
-        
+
+        # 按批打包后并发提交：每批新闻合并为一次LLM调用摊销提示词开销，
+        # 接口调用期间GIL会释放，线程池并发再将总耗时压缩到并发数分之一
+        batch_size = max(self.config.get("batch_size", DEFAULT_BATCH_SIZE), 1)
+        chunks = [
+            news_list[start:start + batch_size]
+            for start in range(0, len(news_list), batch_size)
+        ]
+        max_workers = min(
+            self.config.get("concurrency", DEFAULT_CONCURRENCY), max(len(chunks), 1)
+        )
+        processed_chunks = list(chunks)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._process_news_chunk, chunk): i
+                for i, chunk in enumerate(chunks)
+            }
+            # 按完成顺序收集，用索引映射保持输出顺序；
+            # 单批失败只保留原新闻项，不影响其余批次
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    processed_chunks[i] = future.result()
+                except Exception as e:
+                    logger.error(f"处理第{i+1}批新闻失败: {e}")
+
+        processed_list = [item for chunk in processed_chunks for item in chunk]
         logger.info(f"AI处理完成，共处理 {len(processed_list)} 条新闻")
         return processed_list
+
+    def _process_news_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量处理一组新闻，批量调用失败时降级为逐条处理"""
+        try:
+            pairs = [
+                (
+                    news_item.get("title", ""),
+                    (news_item.get("content", "") or news_item.get("description", ""))[:400],
+                )
+                for news_item in chunk
+            ]
+            results = self.client.generate_batch(
+                pairs, self.title_length, self.summary_length
+            )
+        except Exception as e:
+            logger.warning(f"批量生成失败，降级为逐条处理: {e}")
+            return [self.process_news_item(news_item) for news_item in chunk]
+
+        return [
+            {
+                **news_item,
+                "ai_title": ai_result["title"],
+                "ai_summary": ai_result["summary"],
+                "ai_tag": ai_result["tag"],
+                "original_title": news_item.get("title", ""),
+            }
+            for news_item, ai_result in zip(chunk, results)
+        ]
     
     def categorize_news(self, news_list: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """将新闻按类别分组
@@ -122,33 +211,21 @@ class AIProcessor:
         Returns:
             按类别分组的新闻字典
         """
-        categories = {
-            "科技AI": [],
-            "游戏娱乐": [],
-            "硬件数码": []
-        }
-        
-        # 定义分类关键词
-        tech_keywords = ["AI", "人工智能", "机器学习", "大模型", "科技", "创业", "投资", "开源", "程序员", "算法"]
-        game_keywords = ["游戏", "电竞", "Steam", "直播", "娱乐", "DOTA", "LOL", "王者", "原神", "米哈游"]
-        hardware_keywords = ["芯片", "GPU", "CPU", "手机", "iPhone", "华为", "小米", "硬件", "数码", "平板"]
-        
+        categories = {category: [] for category, _ in _CATEGORY_KEYWORDS}
+
         for news_item in news_list:
             title = news_item.get("ai_title") or news_item.get("title", "")
             content = news_item.get("ai_summary") or news_item.get("content", "")
-            text = title + " " + content
-            
-            # 分类逻辑
-            if any(keyword in text for keyword in tech_keywords):
-                categories["科技AI"].append(news_item)
-            elif any(keyword in text for keyword in game_keywords):
-                categories["游戏娱乐"].append(news_item)
-            elif any(keyword in text for keyword in hardware_keywords):
-                categories["硬件数码"].append(news_item)
+
+            # 按优先级用预编译正则匹配，未命中时默认归入科技AI类；
+            # 先扫标题，多数新闻由标题即可定类，命中后不再扫正文
+            for category, pattern in _CATEGORY_PATTERNS:
+                if pattern.search(title) or pattern.search(content):
+                    categories[category].append(news_item)
+                    break
             else:
-                # 默认分到科技AI类
-                categories["科技AI"].append(news_item)
-        
+                categories[_DEFAULT_CATEGORY].append(news_item)
+
         return categories
     
     def format_for_video(self, categorized_news: Dict[str, List[Dict]]) -> str:
@@ -184,111 +261,100 @@ class AIProcessor:
     
     def _generate_basic_format(self, categorized_news: Dict[str, List[Dict]]) -> str:
         """生成基础格式化内容"""
-        formatted_text = "📺 今日科技热点播报\n\n"
-        
+        parts = ["📺 今日科技热点播报\n\n"]
+
         # 按分类顺序处理
-        category_order = ["科技AI类", "游戏娱乐类", "硬件数码类"]
-        
-        for category in category_order:
+        for category in _CATEGORY_ORDER:
             if category in categorized_news and categorized_news[category]:
-                formatted_text += f"🔸 {category}\n"
-                
+                parts.append(f"🔸 {category}\n")
+
                 for i, news in enumerate(categorized_news[category], 1):
                     title = news.get("ai_title", news.get("title", ""))
                     summary = news.get("ai_summary", "")
                     tag = news.get("ai_tag", "")
                     url = news.get("url", "")
-                    
-                    formatted_text += f"{i}. {title}\n"
+
+                    parts.append(f"{i}. {title}\n")
                     if summary:
-                        formatted_text += f"   {summary}\n"
+                        parts.append(f"   {summary}\n")
                     if tag:
-                        formatted_text += f"   标签: {tag}\n"
+                        parts.append(f"   标签: {tag}\n")
                     if url:
-                        formatted_text += f"   链接: {url}\n"
-                    formatted_text += "\n"
-                
-                formatted_text += "\n"
-        
-        return formatted_text
+                        parts.append(f"   链接: {url}\n")
+                    parts.append("\n")
+
+                parts.append("\n")
+
+        return "".join(parts)
     
     def _generate_video_script(self, categorized_news: Dict[str, List[Dict]]) -> str:
         """生成完整视频播报稿"""
-        script = "🎬 视频播报稿\n\n"
-        script += "大家好，欢迎收看今日科技热点播报。我是您的AI主播，为您带来最新的科技资讯。\n\n"
-        
-        category_order = ["科技AI类", "游戏娱乐类", "硬件数码类"]
-        category_intros = {
-            "科技AI类": "首先，让我们关注人工智能和科技创新领域的最新动态。",
-            "游戏娱乐类": "接下来，我们来看看游戏娱乐行业的热门资讯。", 
-            "硬件数码类": "最后，让我们了解一下硬件数码市场的最新消息。"
-        }
-        
-        for category in category_order:
+        parts = [
+            "🎬 视频播报稿\n\n",
+            "大家好，欢迎收看今日科技热点播报。我是您的AI主播，为您带来最新的科技资讯。\n\n",
+        ]
+
+        for category in _CATEGORY_ORDER:
             if category in categorized_news and categorized_news[category]:
-                script += f"【{category}】\n"
-                script += f"{category_intros[category]}\n\n"
-                
+                parts.append(f"【{category}】\n")
+                parts.append(f"{_CATEGORY_INTROS[category]}\n\n")
+
                 for i, news in enumerate(categorized_news[category], 1):
                     title = news.get("ai_title", news.get("title", ""))
                     summary = news.get("ai_summary", "")
-                    
-                    script += f"第{i}条新闻：{title}\n"
+
+                    parts.append(f"第{i}条新闻：{title}\n")
                     if summary:
-                        script += f"{summary}\n"
-                    script += "\n"
-                
-                script += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-        
-        script += "以上就是今日的科技热点播报，感谢您的收看，我们明天同一时间再见！\n"
-        
-        return script
+                        parts.append(f"{summary}\n")
+                    parts.append("\n")
+
+                parts.append(_HR + "\n\n")
+
+        parts.append("以上就是今日的科技热点播报，感谢您的收看，我们明天同一时间再见！\n")
+
+        return "".join(parts)
     
     def _generate_storyboard(self, categorized_news: Dict[str, List[Dict]]) -> str:
         """生成分镜脚本"""
-        storyboard = "🎥 分镜脚本\n\n"
-        
-        # 开场
-        storyboard += "【镜头1】开场 (0:00-0:05)\n"
-        storyboard += "画面：主播正面特写，背景为科技感十足的虚拟演播室\n"
-        storyboard += "文案：大家好，欢迎收看今日科技热点播报\n"
-        storyboard += "转场：淡入淡出\n\n"
-        
-        category_order = ["科技AI类", "游戏娱乐类", "硬件数码类"]
-        category_visuals = {
-            "科技AI类": "AI芯片、机器人、代码界面等科技元素",
-            "游戏娱乐类": "游戏画面、手柄、电竞场景等娱乐元素",
-            "硬件数码类": "手机、电脑、芯片等硬件产品"
-        }
-        
+        parts = [
+            "🎥 分镜脚本\n\n",
+            # 开场
+            "【镜头1】开场 (0:00-0:05)\n",
+            "画面：主播正面特写，背景为科技感十足的虚拟演播室\n",
+            "文案：大家好，欢迎收看今日科技热点播报\n",
+            "转场：淡入淡出\n\n",
+        ]
+
+        # 先算完全部分段时间偏移，再统一做字符串格式化（数值与文本工作分离）
+        segments = []
         time_offset = 5  # 开场5秒后开始
-        
-        for category_idx, category in enumerate(category_order, 2):
-            if category in categorized_news and categorized_news[category]:
-                news_count = len(categorized_news[category])
+
+        for category_idx, category in enumerate(_CATEGORY_ORDER, 2):
+            news_count = len(categorized_news.get(category) or ())
+            if news_count:
                 segment_duration = min(30, news_count * 8)  # 每条新闻约8秒，最多30秒
-                
-                start_time = time_offset
-                end_time = time_offset + segment_duration
-                
-                storyboard += f"【镜头{category_idx}】{category} ({start_time//60}:{start_time%60:02d}-{end_time//60}:{end_time%60:02d})\n"
-                storyboard += f"画面：{category_visuals[category]}\n"
-                storyboard += f"内容：播报{news_count}条{category}新闻\n"
-                storyboard += "转场：滑动切换\n\n"
-                
-                time_offset = end_time
-        
+                segments.append(
+                    (category_idx, category, news_count, time_offset, time_offset + segment_duration)
+                )
+                time_offset += segment_duration
+
+        for category_idx, category, news_count, start_time, end_time in segments:
+            parts.append(f"【镜头{category_idx}】{category} ({start_time//60}:{start_time%60:02d}-{end_time//60}:{end_time%60:02d})\n")
+            parts.append(f"画面：{_CATEGORY_VISUALS[category]}\n")
+            parts.append(f"内容：播报{news_count}条{category}新闻\n")
+            parts.append("转场：滑动切换\n\n")
+
         # 结尾
         end_start = time_offset
         end_end = time_offset + 5
-        storyboard += f"【镜头{len(category_order)+2}】结尾 ({end_start//60}:{end_start%60:02d}-{end_end//60}:{end_end%60:02d})\n"
-        storyboard += "画面：主播挥手告别，显示订阅提醒\n"
-        storyboard += "文案：感谢收看，明天同一时间再见\n"
-        storyboard += "转场：淡出\n\n"
-        
-        storyboard += f"总时长：约{end_end//60}分{end_end%60:02d}秒\n"
-        
-        return storyboard
+        parts.append(f"【镜头{len(_CATEGORY_ORDER)+2}】结尾 ({end_start//60}:{end_start%60:02d}-{end_end//60}:{end_end%60:02d})\n")
+        parts.append("画面：主播挥手告别，显示订阅提醒\n")
+        parts.append("文案：感谢收看，明天同一时间再见\n")
+        parts.append("转场：淡出\n\n")
+
+        parts.append(f"总时长：约{end_end//60}分{end_end%60:02d}秒\n")
+
+        return "".join(parts)
     
     def _combine_all_formats(self, result: Dict[str, str]) -> str:
         """组合所有格式化内容"""
@@ -298,11 +364,11 @@ class AIProcessor:
             combined += result["basic_format"] + "\n"
         
         if "video_script" in result:
-            combined += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+            combined += _HR + "\n\n"
             combined += result["video_script"] + "\n"
         
         if "storyboard" in result:
-            combined += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+            combined += _HR + "\n\n"
             combined += result["storyboard"]
         
         return combined
@@ -310,30 +376,22 @@ class AIProcessor:
     def _format_traditional(self, categorized_news: Dict[str, List[Dict]]) -> str:
         """传统格式化方法（兼容性保留）"""
         
-        from datetime import datetime
         today = datetime.now().strftime("%Y-%m-%d")
         
         output_lines = []
         
         # 添加标题
         output_lines.append(f"📱 流沙聚·闪讯 | {today}")
-        output_lines.append("━━━━━━━━━━━━━━━━━━━━")
+        output_lines.append(_SEP_HEAVY)
         output_lines.append("")
         
-        # 分类图标映射
-        category_icons = {
-            "科技AI": "🤖",
-            "游戏娱乐": "🎮", 
-            "硬件数码": "💻"
-        }
-        
         for category, news_list in categorized_news.items():
             if not news_list:
                 continue
                 
-            icon = category_icons.get(category, "📰")
+            icon = _CATEGORY_ICONS.get(category, "📰")
             output_lines.append(f"{icon} {category} ({len(news_list)}条)")
-            output_lines.append("─" * 20)
+            output_lines.append(_SEP_LIGHT)
             
             for news_item in news_list:
                 # 使用AI处理后的内容
@@ -1,12 +1,36 @@
 """智谱AI客户端"""
 
 import os
+import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Tuple
 from zhipuai import ZhipuAI
 
+from . import cache
+
 logger = logging.getLogger(__name__)
 
+# 进程级共享的ZhipuAI客户端（按api_key区分），
+# 避免每次实例化ZhipuClient都重建HTTP连接池和TLS握手
+_shared_clients: Dict[str, ZhipuAI] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _get_shared_client(api_key: str) -> ZhipuAI:
+    """返回指定api_key对应的共享ZhipuAI客户端，首次调用时创建"""
+    with _shared_clients_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            client = ZhipuAI(api_key=api_key)
+            _shared_clients[api_key] = client
+        return client
+
+MODEL_NAME = "glm-4-flash"
+
+# 标签生成失败时的降级关键词，模块加载时构造一次
+_FALLBACK_KEYWORDS = ("AI", "人工智能", "芯片", "GPU", "CPU", "手机", "游戏", "科技", "创业", "投资")
+
 
 class ZhipuClient:
     """智谱AI客户端"""
@@ -18,16 +42,180 @@ class ZhipuClient:
             api_key: API密钥，如果为None则从环境变量获取
         """
         self.api_key = api_key or os.getenv("ZHIPU_API_KEY")
-        print(f"🔍 ZhipuClient初始化，API Key存在: {bool(self.api_key)}")
-        
+        logger.debug(f"ZhipuClient初始化，API Key存在: {bool(self.api_key)}")
+
         if not self.api_key:
-            print("❌ 智谱AI API Key未配置")
             raise ValueError("智谱AI API Key未配置")
-        
-        print("🔍 创建ZhipuAI客户端...")
-        self.client = ZhipuAI(api_key=self.api_key)
-        print("✅ ZhipuAI客户端创建成功")
+
+        self.client = _get_shared_client(self.api_key)
+        logger.debug("ZhipuAI客户端创建成功")
     
+    def generate_all(
+        self,
+        content: str,
+        title: str,
+        title_length: int = 30,
+        summary_length: int = 100,
+    ) -> Dict[str, str]:
+        """一次调用同时生成标题、摘要和标签
+
+        将原先三次独立请求合并为一次JSON结构化输出，
+        共享的新闻内容只需发送一遍，请求数和提示词token都降为原来的三分之一。
+
+        Args:
+            content: 新闻内容
+            title: 新闻标题
+            title_length: 标题最大长度
+            summary_length: 摘要最大长度
+
+        Returns:
+            包含 title/summary/tag 三个键的字典
+        """
+        cache_key = cache.make_key(
+            MODEL_NAME, "all", str(title_length), str(summary_length), title, content[:1000]
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            try:
+                return json.loads(cached)
+            except (ValueError, TypeError):
+                pass
+
+        try:
+            prompt = f"""
+请为以下新闻同时生成三项内容，以JSON对象返回，格式为 {{"title": "...", "summary": "...", "tag": "..."}}：
+1. title：{title_length}字以内的吸引人标题，突出核心关键词，符合中文表达习惯
+2. summary：{summary_length}字以内的精华摘要，提取核心信息，不要包含"据报道"等冗余表述
+3. tag：1个3-8字的话题标签，突出核心主题，不要#号
+
+原标题：{title}
+内容：{content[:1000]}
+
+只返回JSON对象，不要其他内容。"""
+
+            response = self.client.chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=350,
+                temperature=0.7
+            )
+
+            result = json.loads(response.choices[0].message.content.strip())
+
+            # 防御性截断，保证长度限制
+            ai_title = str(result.get("title") or title).strip()
+            if len(ai_title) > title_length:
+                ai_title = ai_title[:title_length-3] + "..."
+            ai_summary = str(result.get("summary") or "").strip()
+            if len(ai_summary) > summary_length:
+                ai_summary = ai_summary[:summary_length-3] + "..."
+            ai_tag = str(result.get("tag") or "").replace("#", "").strip()
+            if not ai_tag:
+                ai_tag = self._extract_keyword_from_title(title)
+
+            fused = {"title": ai_title, "summary": ai_summary, "tag": ai_tag}
+            cache.set(cache_key, json.dumps(fused, ensure_ascii=False))
+            return fused
+
+        except Exception as e:
+            logger.error(f"合并生成失败，降级为分项调用: {e}")
+            # 降级处理：回退到三次独立调用
+            return {
+                "title": self.generate_title(content, title, title_length),
+                "summary": self.generate_summary(content, title, summary_length),
+                "tag": self.generate_tag(content, title),
+            }
+
+    def generate_batch(
+        self,
+        items: List[Tuple[str, str]],
+        title_length: int = 30,
+        summary_length: int = 100,
+    ) -> List[Dict[str, str]]:
+        """将多条新闻打包为一次调用，批量生成标题、摘要和标签
+
+        多条新闻共享同一份指令说明，提示词token按批次摊销，
+        请求数降为每批一次。已缓存的条目直接复用，只有未命中的
+        条目进入提示词。
+
+        Args:
+            items: (标题, 内容) 元组列表
+            title_length: 标题最大长度
+            summary_length: 摘要最大长度
+
+        Returns:
+            与输入同序的结果列表，每项包含 title/summary/tag 三个键
+
+        Raises:
+            解析失败或返回条数不符时抛出异常，由调用方降级为逐条处理
+        """
+        keys = [
+            cache.make_key(
+                MODEL_NAME, "batch", str(title_length), str(summary_length), title, content[:400]
+            )
+            for title, content in items
+        ]
+        results: List[Optional[Dict[str, str]]] = []
+        for key in keys:
+            cached = cache.get(key)
+            try:
+                results.append(json.loads(cached) if cached is not None else None)
+            except (ValueError, TypeError):
+                results.append(None)
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if pending:
+            item_blocks = "\n\n".join(
+                f"{n}. 原标题：{items[i][0]}\n内容：{items[i][1][:400]}"
+                for n, i in enumerate(pending, 1)
+            )
+            prompt = f"""
+请为以下{len(pending)}条新闻分别生成内容，以JSON对象返回，格式为 {{"results": [{{"title": "...", "summary": "...", "tag": "..."}}, ...]}}，results数组与新闻顺序一致、条数相同：
+1. title：{title_length}字以内的吸引人标题，突出核心关键词，符合中文表达习惯
+2. summary：{summary_length}字以内的精华摘要，提取核心信息，不要包含"据报道"等冗余表述
+3. tag：1个3-8字的话题标签，突出核心主题，不要#号
+
+{item_blocks}
+
+只返回JSON对象，不要其他内容。"""
+
+            response = self.client.chat.completions.create(
+                model=MODEL_NAME,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                max_tokens=350 * len(pending),
+                temperature=0.7
+            )
+
+            parsed = json.loads(response.choices[0].message.content.strip())
+            batch = parsed.get("results", parsed) if isinstance(parsed, dict) else parsed
+            if not isinstance(batch, list) or len(batch) != len(pending):
+                raise ValueError(f"批量生成返回条数不符: 期望{len(pending)}，实际{len(batch) if isinstance(batch, list) else type(batch)}")
+
+            for i, raw in zip(pending, batch):
+                title, _ = items[i]
+                # 防御性截断，保证长度限制
+                ai_title = str(raw.get("title") or title).strip()
+                if len(ai_title) > title_length:
+                    ai_title = ai_title[:title_length-3] + "..."
+                ai_summary = str(raw.get("summary") or "").strip()
+                if len(ai_summary) > summary_length:
+                    ai_summary = ai_summary[:summary_length-3] + "..."
+                ai_tag = str(raw.get("tag") or "").replace("#", "").strip()
+                if not ai_tag:
+                    ai_tag = self._extract_keyword_from_title(title)
+
+                result = {"title": ai_title, "summary": ai_summary, "tag": ai_tag}
+                cache.set(keys[i], json.dumps(result, ensure_ascii=False))
+                results[i] = result
+
+        return results
+
     def generate_summary(self, content: str, title: str, max_length: int = 100) -> str:
         """生成新闻摘要
         
@@ -39,6 +227,11 @@ class ZhipuClient:
         Returns:
             生成的摘要
         """
+        cache_key = cache.make_key(MODEL_NAME, "summary", str(max_length), title, content[:1000])
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             prompt = f"""
 请为以下新闻生成一个{max_length}字以内的精华摘要，要求：
@@ -53,7 +246,7 @@ class ZhipuClient:
 摘要："""
 
             response = self.client.chat.completions.create(
-                model="glm-4-flash",
+                model=MODEL_NAME,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
@@ -66,7 +259,8 @@ class ZhipuClient:
             # 确保摘要长度不超过限制
             if len(summary) > max_length:
                 summary = summary[:max_length-3] + "..."
-            
+
+            cache.set(cache_key, summary)
             return summary
             
         except Exception as e:
@@ -85,6 +279,11 @@ class ZhipuClient:
         Returns:
             优化后的标题
         """
+        cache_key = cache.make_key(MODEL_NAME, "title", str(max_length), original_title, content[:500])
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             prompt = f"""
 请为以下新闻生成一个{max_length}字以内的吸引人标题，要求：
@@ -99,7 +298,7 @@ class ZhipuClient:
 优化标题："""
 
             response = self.client.chat.completions.create(
-                model="glm-4-flash",
+                model=MODEL_NAME,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
@@ -112,7 +311,8 @@ class ZhipuClient:
             # 确保标题长度不超过限制
             if len(title) > max_length:
                 title = title[:max_length-3] + "..."
-            
+
+            cache.set(cache_key, title)
             return title
             
         except Exception as e:
@@ -130,6 +330,11 @@ class ZhipuClient:
         Returns:
             生成的标签（不含#号）
         """
+        cache_key = cache.make_key(MODEL_NAME, "tag", title, content[:300])
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             prompt = f"""
 请为以下新闻生成1个最相关的话题标签，要求：
@@ -144,7 +349,7 @@ class ZhipuClient:
 标签："""
 
             response = self.client.chat.completions.create(
-                model="glm-4-flash",
+                model=MODEL_NAME,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
@@ -156,7 +361,8 @@ class ZhipuClient:
             
             # 清理标签格式
             tag = tag.replace("#", "").strip()
-            
+
+            cache.set(cache_key, tag)
             return tag
             
         except Exception as e:
@@ -167,8 +373,7 @@ class ZhipuClient:
     def _extract_keyword_from_title(self, title: str) -> str:
         """从标题提取关键词作为降级标签"""
         # 简单的关键词提取逻辑
-        keywords = ["AI", "人工智能", "芯片", "GPU", "CPU", "手机", "游戏", "科技", "创业", "投资"]
-        for keyword in keywords:
+        for keyword in _FALLBACK_KEYWORDS:
             if keyword in title:
                 return keyword
         
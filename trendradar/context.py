@@ -19,6 +19,7 @@ from trendradar.utils.time import (
 from trendradar.core import (
     load_frequency_words,
     matches_word_groups,
+    matches_word_groups_batch,
     save_titles_to_file,
     read_all_today_titles,
     detect_latest_new_titles,
@@ -206,6 +207,16 @@ class AppContext:
         """检查标题是否匹配词组规则"""
         return matches_word_groups(title, word_groups, filter_words, global_filters)
 
+    def matches_word_groups_batch(
+        self,
+        titles: List[str],
+        word_groups: List[Dict],
+        filter_words: List[str],
+        global_filters: Optional[List[str]] = None,
+    ) -> List[bool]:
+        """批量检查标题是否匹配词组规则"""
+        return matches_word_groups_batch(titles, word_groups, filter_words, global_filters)
+
     # === 统计分析 ===
 
     def count_frequency(
@@ -256,6 +267,7 @@ class AppContext:
             mode=mode,
             rank_threshold=self.rank_threshold,
             matches_word_groups_func=self.matches_word_groups,
+            matches_word_groups_batch_func=self.matches_word_groups_batch,
             load_frequency_words_func=self.load_frequency_words,
             ai_config=self.ai_config,
         )
@@ -287,6 +299,7 @@ class AppContext:
             time_filename=self.format_time(),
             render_html_func=lambda *args, **kwargs: self.render_html(*args, **kwargs),
             matches_word_groups_func=self.matches_word_groups,
+            matches_word_groups_batch_func=self.matches_word_groups_batch,
             load_frequency_words_func=self.load_frequency_words,
             enable_index_copy=True,
             ai_config=self.ai_config,
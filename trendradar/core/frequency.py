@@ -192,3 +192,78 @@ def matches_word_groups(
         return True
 
     return False
+
+
+def matches_word_groups_batch(
+    titles: List[str],
+    word_groups: List[Dict],
+    filter_words: List[str],
+    global_filters: Optional[List[str]] = None
+) -> List[bool]:
+    """
+    批量检查标题是否匹配词组规则
+
+    结果与逐条调用 matches_word_groups 一致，但配置词的小写化
+    只做一次，适合一次过滤整批标题的报告场景。
+
+    Args:
+        titles: 标题列表
+        word_groups: 词组列表
+        filter_words: 过滤词列表
+        global_filters: 全局过滤词列表
+
+    Returns:
+        与 titles 同序的布尔列表
+    """
+    lowered_globals = [word.lower() for word in (global_filters or [])]
+    lowered_filters = [word.lower() for word in filter_words]
+    lowered_groups = [
+        (
+            [word.lower() for word in group["required"]],
+            [word.lower() for word in group["normal"]],
+        )
+        for group in word_groups
+    ]
+
+    results = []
+    for title in titles:
+        # 防御性类型检查：确保 title 是有效字符串
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            results.append(False)
+            continue
+
+        title_lower = title.lower()
+
+        # 全局过滤检查（优先级最高）
+        if any(word in title_lower for word in lowered_globals):
+            results.append(False)
+            continue
+
+        # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
+        if not word_groups:
+            results.append(True)
+            continue
+
+        # 过滤词检查
+        if any(word in title_lower for word in lowered_filters):
+            results.append(False)
+            continue
+
+        # 词组匹配检查
+        matched = False
+        for required_words, normal_words in lowered_groups:
+            if required_words and not all(
+                word in title_lower for word in required_words
+            ):
+                continue
+            if normal_words and not any(
+                word in title_lower for word in normal_words
+            ):
+                continue
+            matched = True
+            break
+        results.append(matched)
+
+    return results
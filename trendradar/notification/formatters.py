@@ -6,6 +6,59 @@
 """
 
 import re
+from functools import lru_cache
+
+# strip_markdown 的全部规则合并为单个交替正则，整串只扫描一次；
+# 分支顺序保证 ** 优先于 *、__ 优先于 _、<font> 优先于裸HTML标签
+_MD_TOKEN_PATTERN = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|__(?P<ubold>.+?)__'
+    r'|\*(?P<italic>.+?)\*'
+    r'|_(?P<uitalic>.+?)_'
+    r'|~~(?P<strike>.+?)~~'
+    r'|\[(?P<ltext>[^\]]+)\]\((?P<lurl>[^)]+)\)'
+    r'|`(?P<code>.+?)`'
+    r'|<font[^>]*>(?P<font>.+?)</font>'
+    r'|(?P<tag><[^>]+>)'
+    r'|(?P<quote>^>\s*)'
+    r'|(?P<heading>^#+\s*)'
+    r'|(?P<hr>^[\-\*]{3,}\s*$)',
+    re.MULTILINE,
+)
+
+# 整段直接删除（不保留内容）的分支
+_DROP_TOKENS = frozenset({"tag", "quote", "heading", "hr"})
+
+_BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+# 快速预检：文本中完全不含任何规则可能命中的字符时，直接跳过全部替换
+_MD_QUICK_CHECK = re.compile(r'[*_~`#>\[<\-]|\n{3,}')
+
+# convert_markdown_to_mrkdwn 使用的正则
+_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_BOLD_PATTERN = re.compile(r'\*\*([^*]+)\*\*')
+
+
+def _strip_tokens(text: str) -> str:
+    """用单次finditer游标遍历去除markdown标记，嵌套格式递归处理"""
+    parts = []
+    cursor = 0
+    for match in _MD_TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        parts.append(text[cursor:match.start()])
+        if kind == "lurl":
+            # 链接 [text](url) -> text url（保留 URL）
+            parts.append(_strip_tokens(match.group("ltext")))
+            parts.append(" ")
+            parts.append(match.group("lurl"))
+        elif kind not in _DROP_TOKENS:
+            inner = match.group(kind)
+            parts.append(_strip_tokens(inner) if _MD_QUICK_CHECK.search(inner) else inner)
+        cursor = match.end()
+    if not parts:
+        return text
+    parts.append(text[cursor:])
+    return "".join(parts)
 
 
 def format_ai_content_for_platform(ai_content: str, platform: str) -> str:
@@ -33,8 +86,8 @@ def format_ai_content_for_platform(ai_content: str, platform: str) -> str:
         # Telegram支持markdown，保持原样
         return ai_content
     elif platform in ["bark", "ntfy"]:
-        # 移动推送平台，简化格式
-        return strip_markdown(ai_content)
+        # 移动推送平台，简化格式；多平台/多接收者广播时同一内容反复出现，走缓存
+        return _strip_markdown_cached(ai_content)
     else:
         # 默认保持原格式
         return ai_content
@@ -49,45 +102,23 @@ def strip_markdown(text: str) -> str:
     Returns:
         纯文本内容
     """
-    # 去除粗体 **text** 或 __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
+    # 纯文本（不含任何markdown字符）直接返回，大段播报内容多为此类
+    if not _MD_QUICK_CHECK.search(text):
+        return text.strip()
 
-    # 去除斜体 *text* 或 _text_
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'_(.+?)_', r'\1', text)
-
-    # 去除删除线 ~~text~~
-    text = re.sub(r'~~(.+?)~~', r'\1', text)
-
-    # 转换链接 [text](url) -> text url（保留 URL）
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\1 \2', text)
-
-    # 去除图片 ![alt](url) -> alt
-    text = re.sub(r'!\[(.+?)\]\(.+?\)', r'\1', text)
-
-    # 去除行内代码 `code`
-    text = re.sub(r'`(.+?)`', r'\1', text)
-
-    # 去除引用符号 >
-    text = re.sub(r'^>\s*', '', text, flags=re.MULTILINE)
-
-    # 去除标题符号 # ## ### 等
-    text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
-
-    # 去除水平分割线 --- 或 ***
-    text = re.sub(r'^[\-\*]{3,}\s*$', '', text, flags=re.MULTILINE)
-
-    # 去除 HTML 标签 <font color='xxx'>text</font> -> text
-    text = re.sub(r'<font[^>]*>(.+?)</font>', r'\1', text)
-    text = re.sub(r'<[^>]+>', '', text)
+    # 单次扫描去除全部markdown标记
+    text = _strip_tokens(text)
 
     # 清理多余的空行（保留最多两个连续空行）
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_PATTERN.sub('\n\n', text)
 
     return text.strip()
 
 
+# 同一AI内容在一次广播中会被多个平台/接收者重复转换，缓存已剥离的结果
+_strip_markdown_cached = lru_cache(maxsize=128)(strip_markdown)
+
+
 def convert_markdown_to_mrkdwn(content: str) -> str:
     """
     将标准 Markdown 转换为 Slack 的 mrkdwn 格式
@@ -104,9 +135,9 @@ def convert_markdown_to_mrkdwn(content: str) -> str:
         Slack mrkdwn 格式的内容
     """
     # 1. 转换链接格式: [文本](url) → <url|文本>
-    content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<\2|\1>', content)
+    content = _LINK_PATTERN.sub(r'<\2|\1>', content)
 
     # 2. 转换粗体: **文本** → *文本*
-    content = re.sub(r'\*\*([^*]+)\*\*', r'*\1*', content)
+    content = _BOLD_PATTERN.sub(r'*\1*', content)
 
     return content
@@ -7,24 +7,101 @@
 - generate_html_report: 生成 HTML 报告
 """
 
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Optional, Callable
 import os
 import logging
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _cached_frequency_words(load_frequency_words_func: Callable):
+    """缓存频率词文件的解析结果
+
+    一次运行会连续生成多份报告（当日汇总/当前榜单/增量），
+    每份都重新读取并解析同一个频率词文件；进程内按加载函数
+    缓存一次解析结果即可。
+    """
+    return load_frequency_words_func()
+
+
+def _normalize_title(title_data: Dict) -> Dict:
+    """原地归一标题字典：补默认值并统一 mobileUrl -> mobile_url 键名（幂等）"""
+    title_data.setdefault("url", "")
+    title_data["mobile_url"] = title_data.pop(
+        "mobileUrl", title_data.get("mobile_url", "")
+    )
+    title_data.setdefault("is_new", False)
+    return title_data
+
+
+# 进程内已创建过的输出目录，跳过重复 mkdir 的 stat 系统调用
+_CREATED_DIRS = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """确保目录存在；同一进程内已创建过的目录不再重复 mkdir"""
+    key = str(path)
+    if key not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(key)
+
+
+def _link_or_write(src: str, dest: Path, data: bytes) -> None:
+    """将 dest 硬链接到已写出的 src，内容零拷贝；跨文件系统时退回直接写入
+
+    index.html 副本与报告文件字节完全相同，同一文件系统上硬链接即可，
+    不占额外磁盘也不再写一遍数据；Docker 卷挂载等跨设备场景 os.link
+    会抛 OSError，此时回退为写入同一份字节串。
+    """
+    try:
+        dest.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dest)
+    except OSError:
+        _copy_contents(src, dest, data)
+
+
+def _copy_contents(src: str, dest: Path, data: bytes) -> None:
+    """复制报告内容到 dest：Linux 上优先 os.sendfile 内核态零拷贝
+
+    src 刚写出、还在页缓存中，sendfile 直接在内核里搬运，字节串
+    不再经过用户态；平台不支持或复制中断时退回写入内存中的字节串。
+    """
+    if hasattr(os, "sendfile"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(
+                        fdst.fileno(), fsrc.fileno(), offset, size - offset
+                    )
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+        except OSError:
+            pass
+    dest.write_bytes(data)
+
+
 # 导入AI处理器
 try:
     from ..ai.processor import AIProcessor
-    print("✅ AIProcessor导入成功")
 except ImportError as e:
-    print(f"❌ AIProcessor导入失败: {e}")
+    logger.debug("AIProcessor导入失败: %s", e)
     AIProcessor = None
 except Exception as e:
-    print(f"❌ AIProcessor导入异常: {e}")
+    logger.debug("AIProcessor导入异常: %s", e)
     AIProcessor = None
 
-logger = logging.getLogger(__name__)
-
 
 def prepare_report_data(
     stats: List[Dict],
@@ -36,6 +113,7 @@ def prepare_report_data(
     matches_word_groups_func: Optional[Callable] = None,
     load_frequency_words_func: Optional[Callable] = None,
     ai_config: Optional[Dict] = None,
+    matches_word_groups_batch_func: Optional[Callable] = None,
 ) -> Dict:
     """
     准备报告数据
@@ -50,155 +128,200 @@ def prepare_report_data(
         matches_word_groups_func: 词组匹配函数
         load_frequency_words_func: 加载频率词函数
         ai_config: AI处理配置
+        matches_word_groups_batch_func: 批量词组匹配函数，提供时整批标题一次过滤
 
     Returns:
         Dict: 准备好的报告数据
     """
     # 初始化AI处理器
     ai_processor = None
-    print(f"🔍 调试信息: ai_config = {ai_config}")
-    print(f"🔍 调试信息: AIProcessor = {AIProcessor}")
-    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ai_config=%s AIProcessor=%s", ai_config, AIProcessor)
+
     if ai_config and AIProcessor:
         try:
-            print("🔍 开始初始化AI处理器...")
             ai_processor = AIProcessor(ai_config)
-            print(f"🔍 AI处理器创建完成，enabled = {ai_processor.enabled}")
             if ai_processor.enabled:
-                print("✅ AI智能处理已启用")
                 logger.info("AI智能处理已启用")
-            else:
-                print("❌ AI智能处理未启用")
         except Exception as e:
-            print(f"❌ 初始化AI处理器失败: {e}")
             logger.error(f"初始化AI处理器失败: {e}")
     else:
-        print(f"❌ AI配置或处理器不可用: ai_config={bool(ai_config)}, AIProcessor={bool(AIProcessor)}")
+        logger.debug(
+            "AI配置或处理器不可用: ai_config=%s, AIProcessor=%s",
+            bool(ai_config), bool(AIProcessor),
+        )
     
     processed_new_titles = []
+    total_new_count = 0
+
+    # AI启用时在下方构建循环中顺带收集待处理新闻，免去整表二次遍历；
+    # 统计项与新增项分开收集，保持"统计在前、新增在后"的原有处理顺序
+    # 同一篇文章常命中多个关键词而重复出现，收集时即按 url（缺失时按标题）
+    # 去重，AI只处理唯一条目，结果再回填到每个原始条目
+    ai_enabled = bool(ai_processor and ai_processor.enabled)
+    ai_stat_items = []
+    ai_new_items = []
+    ai_unique_items = {}
 
     # 在增量模式下隐藏新增新闻区域
     hide_new_section = mode == "incremental"
 
-    # 只有在非隐藏模式下才处理新增新闻部分
-    if not hide_new_section:
-        filtered_new_titles = {}
-        if new_titles and id_to_name:
-            # 如果提供了匹配函数，使用它过滤
-            if matches_word_groups_func and load_frequency_words_func:
-                word_groups, filter_words, global_filters = load_frequency_words_func()
-                for source_id, titles_data in new_titles.items():
-                    filtered_titles = {}
-                    for title, title_data in titles_data.items():
-                        if matches_word_groups_func(title, word_groups, filter_words, global_filters):
-                            filtered_titles[title] = title_data
-                    if filtered_titles:
-                        filtered_new_titles[source_id] = filtered_titles
-            else:
-                # 没有匹配函数时，使用全部
-                filtered_new_titles = new_titles
-
-            # 打印过滤后的新增热点数（与推送显示一致）
-            original_new_count = sum(len(titles) for titles in new_titles.values()) if new_titles else 0
+    # 增量模式（每隔几分钟调用一次）或没有新增数据/名称映射时，
+    # 频率词加载与过滤相关的分配整块跳过
+    if not hide_new_section and new_titles and id_to_name:
+        # 如果提供了匹配函数，使用它过滤
+        if matches_word_groups_func and load_frequency_words_func:
+            filtered_new_titles = {}
+            word_groups, filter_words, global_filters = _cached_frequency_words(
+                load_frequency_words_func
+            )
+            for source_id, titles_data in new_titles.items():
+                if matches_word_groups_batch_func:
+                    # 整批标题一次过滤，配置词的预处理按批摊销
+                    titles = list(titles_data)
+                    mask = matches_word_groups_batch_func(
+                        titles, word_groups, filter_words, global_filters
+                    )
+                    filtered_titles = {
+                        title: titles_data[title]
+                        for title, matched in zip(titles, mask)
+                        if matched
+                    }
+                else:
+                    filtered_titles = {
+                        title: title_data
+                        for title, title_data in titles_data.items()
+                        if matches_word_groups_func(
+                            title, word_groups, filter_words, global_filters
+                        )
+                    }
+                if filtered_titles:
+                    filtered_new_titles[source_id] = filtered_titles
+        else:
+            # 没有匹配函数时，使用全部
+            filtered_new_titles = new_titles
+
+        # 记录过滤后的新增热点数（与推送显示一致）
+        if logger.isEnabledFor(logging.DEBUG):
+            original_new_count = sum(len(titles) for titles in new_titles.values())
             filtered_new_count = sum(len(titles) for titles in filtered_new_titles.values()) if filtered_new_titles else 0
             if original_new_count > 0:
-                print(f"频率词过滤后：{filtered_new_count} 条新增热点匹配（原始 {original_new_count} 条）")
+                logger.debug(
+                    "频率词过滤后：%s 条新增热点匹配（原始 %s 条）",
+                    filtered_new_count, original_new_count,
+                )
 
-        if filtered_new_titles and id_to_name:
-            for source_id, titles_data in filtered_new_titles.items():
-                source_name = id_to_name.get(source_id, source_id)
-                source_titles = []
+        # 绑定方法提出循环，省去每轮迭代的属性查找
+        id_get = id_to_name.get
+        for source_id, titles_data in filtered_new_titles.items():
+            source_name = id_get(source_id, source_id)
+            source_titles = []
 
-                for title, title_data in titles_data.items():
-                    url = title_data.get("url", "")
-                    mobile_url = title_data.get("mobileUrl", "")
-                    ranks = title_data.get("ranks", [])
+            for title, title_data in titles_data.items():
+                url = title_data.get("url", "")
+                mobile_url = title_data.get("mobileUrl", "")
+                ranks = title_data.get("ranks", [])
 
-                    processed_title = {
+                processed_title = {
+                    "title": title,
+                    "source_name": source_name,
+                    "time_display": "",
+                    "count": 1,
+                    "ranks": ranks,
+                    "rank_threshold": rank_threshold,
+                    "url": url,
+                    "mobile_url": mobile_url,
+                    "is_new": True,
+                }
+                source_titles.append(processed_title)
+                if ai_enabled:
+                    news_item = {
                         "title": title,
-                        "source_name": source_name,
-                        "time_display": "",
-                        "count": 1,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
+                        "content": "",
                         "url": url,
-                        "mobile_url": mobile_url,
-                        "is_new": True,
+                        "source": source_name,
+                        "keyword": "新增热点",
                     }
-                    source_titles.append(processed_title)
-
-                if source_titles:
-                    processed_new_titles.append(
-                        {
-                            "source_id": source_id,
-                            "source_name": source_name,
-                            "titles": source_titles,
-                        }
-                    )
+                    ai_new_items.append(news_item)
 
-    processed_stats = []
-    for stat in stats:
-        if stat["count"] <= 0:
-            continue
-
-        processed_titles = []
-        for title_data in stat["titles"]:
-            processed_title = {
-                "title": title_data["title"],
-                "source_name": title_data["source_name"],
-                "time_display": title_data["time_display"],
-                "count": title_data["count"],
-                "ranks": title_data["ranks"],
-                "rank_threshold": title_data["rank_threshold"],
-                "url": title_data.get("url", ""),
-                "mobile_url": title_data.get("mobileUrl", ""),
-                "is_new": title_data.get("is_new", False),
-            }
-            processed_titles.append(processed_title)
+            if source_titles:
+                total_new_count += len(source_titles)
+                processed_new_titles.append(
+                    {
+                        "source_id": source_id,
+                        "source_name": source_name,
+                        "titles": source_titles,
+                    }
+                )
 
-        processed_stats.append(
+    # 源标题字典已包含全部展示字段，_normalize_title 原地归一后直接复用；
+    # 列表推导式让追加走LIST_APPEND单字节码，减少解释器循环开销
+    if not ai_enabled:
+        processed_stats = [
             {
                 "word": stat["word"],
                 "count": stat["count"],
                 "percentage": stat.get("percentage", 0),
-                "titles": processed_titles,
+                "titles": [
+                    _normalize_title(title_data) for title_data in stat["titles"]
+                ],
             }
-        )
-
-    # AI智能处理
-    if ai_processor and ai_processor.enabled:
-        logger.info("开始AI智能处理...")
-        
-        # 收集所有新闻数据进行AI处理
-        all_news_items = []
-        
-        # 处理统计数据中的新闻
-        for stat in processed_stats:
-            for title_data in stat["titles"]:
-                news_item = {
-                    "title": title_data["title"],
-                    "content": title_data.get("content", ""),
-                    "url": title_data.get("url", ""),
-                    "source": title_data.get("source_name", ""),
-                    "keyword": stat["word"]
+            for stat in stats
+            if stat["count"] > 0
+        ]
+    else:
+        # AI启用时单遍完成归一与待处理新闻收集
+        processed_stats = []
+        for stat in stats:
+            if stat["count"] <= 0:
+                continue
+            word = stat["word"]
+            titles = [_normalize_title(title_data) for title_data in stat["titles"]]
+            processed_stats.append(
+                {
+                    "word": word,
+                    "count": stat["count"],
+                    "percentage": stat.get("percentage", 0),
+                    "titles": titles,
                 }
-                all_news_items.append(news_item)
-        
-        # 处理新增新闻
-        for source in processed_new_titles:
-            for title_data in source["titles"]:
+            )
+            for title_data in titles:
                 news_item = {
                     "title": title_data["title"],
                     "content": title_data.get("content", ""),
-                    "url": title_data.get("url", ""),
+                    "url": title_data["url"],
                     "source": title_data.get("source_name", ""),
-                    "keyword": "新增热点"
+                    "keyword": word,
                 }
-                all_news_items.append(news_item)
-        
+                ai_stat_items.append(news_item)
+                ai_unique_items.setdefault(
+                    news_item["url"] or news_item["title"], news_item
+                )
+
+    # AI智能处理
+    if ai_enabled:
+        logger.info("开始AI智能处理...")
+
+        # 新增项在统计项之后去重，统计项优先占位，与回填顺序保持一致
+        for news_item in ai_new_items:
+            ai_unique_items.setdefault(
+                news_item["url"] or news_item["title"], news_item
+            )
+
         # 执行AI处理
-        if all_news_items:
-            processed_news = ai_processor.process_news_list(all_news_items)
+        if ai_unique_items:
+            processed_unique = ai_processor.process_news_list(
+                list(ai_unique_items.values())
+            )
+            processed_by_key = {
+                (item.get("url") or item.get("title", "")): item
+                for item in processed_unique
+            }
+            # chain惰性遍历两段收集结果，不再拼接中间大列表
+            processed_news = [
+                processed_by_key.get(news_item["url"] or news_item["title"], news_item)
+                for news_item in chain(ai_stat_items, ai_new_items)
+            ]
             categorized_news = ai_processor.categorize_news(processed_news)
             
             # 如果启用视频格式，生成格式化内容
@@ -211,9 +334,7 @@ def prepare_report_data(
                     "stats": processed_stats,
                     "new_titles": processed_new_titles,
                     "failed_ids": failed_ids or [],
-                    "total_new_count": sum(
-                        len(source["titles"]) for source in processed_new_titles
-                    ),
+                    "total_new_count": total_new_count,
                     "ai_processed": True,
                     "ai_content": formatted_content,
                     "ai_categories": categorized_news,
@@ -223,9 +344,7 @@ def prepare_report_data(
         "stats": processed_stats,
         "new_titles": processed_new_titles,
         "failed_ids": failed_ids or [],
-        "total_new_count": sum(
-            len(source["titles"]) for source in processed_new_titles
-        ),
+        "total_new_count": total_new_count,
     }
 
 
@@ -247,6 +366,7 @@ def generate_html_report(
     load_frequency_words_func: Optional[Callable] = None,
     enable_index_copy: bool = True,
     ai_config: Optional[Dict] = None,
+    matches_word_groups_batch_func: Optional[Callable] = None,
 ) -> str:
     """
     生成 HTML 报告
@@ -268,6 +388,7 @@ def generate_html_report(
         matches_word_groups_func: 词组匹配函数
         load_frequency_words_func: 加载频率词函数
         enable_index_copy: 是否复制到 index.html
+        matches_word_groups_batch_func: 批量词组匹配函数
 
     Returns:
         str: 生成的 HTML 文件路径
@@ -284,7 +405,7 @@ def generate_html_report(
 
     # 构建输出路径
     output_path = Path(output_dir) / date_folder / "html"
-    output_path.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(output_path)
     file_path = str(output_path / filename)
 
     # 准备报告数据
@@ -298,6 +419,7 @@ def generate_html_report(
         matches_word_groups_func,
         load_frequency_words_func,
         ai_config,
+        matches_word_groups_batch_func,
     )
 
     # 渲染 HTML 内容
@@ -309,21 +431,17 @@ def generate_html_report(
         # 默认简单 HTML
         html_content = f"<html><body><h1>Report</h1><pre>{report_data}</pre></body></html>"
 
-    # 写入文件
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    # 写入文件：只编码一次，三份输出复用同一字节串，
+    # 避免文本模式写入时对大报告重复做 UTF-8 编码
+    html_bytes = html_content.encode("utf-8")
+    with open(file_path, "wb") as f:
+        f.write(html_bytes)
 
-    # 如果是每日汇总且启用 index 复制
+    # 如果是每日汇总且启用 index 复制：
+    # 根目录副本供 GitHub Pages 访问，output 目录副本供 Docker Volume 挂载访问
     if is_daily_summary and enable_index_copy:
-        # 生成到根目录（供 GitHub Pages 访问）
-        root_index_path = Path("index.html")
-        with open(root_index_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        # 同时生成到 output 目录（供 Docker Volume 挂载访问）
-        output_index_path = Path(output_dir) / "index.html"
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        with open(output_index_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        _ensure_dir(Path(output_dir))
+        for dest in (Path("index.html"), Path(output_dir) / "index.html"):
+            _link_or_write(file_path, dest, html_bytes)
 
     return file_path